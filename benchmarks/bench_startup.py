@@ -0,0 +1,61 @@
+"""Measure the cold-start time of an API worker.
+
+Each run imports ``src.runner`` in a fresh interpreter, as a scale-to-zero
+instance or a Gunicorn master with ``--preload`` would, and reports how long
+the import, app creation and preload took.
+
+Usage: python benchmarks/bench_startup.py [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INGESTION_MODULES = ("requests", "bs4", "lxml")
+
+SNIPPET = f"""
+import sys, time
+start = time.perf_counter()
+import src.runner
+elapsed = time.perf_counter() - start
+loaded = [m for m in {INGESTION_MODULES!r} if m in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def measure(runs):
+    env = {
+        **os.environ,
+        "SQLALCHEMY_DB_URI": os.environ.get("SQLALCHEMY_DB_URI", "sqlite://"),
+        "SECRET_KEY": "bench",
+        "JWT_SECRET_KEY": "bench",
+        # Keep the rate limiter's SQLite file out of the repo and the timing
+        "RATELIMIT_BACKEND": "memory",
+        "PYTHONWARNINGS": "ignore",
+    }
+    timings = []
+    loaded = ""
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", SNIPPET],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        timings.append(float(output[0]))
+        loaded = output[1] if len(output) > 1 else ""
+    return timings, loaded
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    timings, loaded = measure(runs)
+    print(f"cold start over {runs} runs:")
+    print(f"  min    {min(timings) * 1000:8.1f} ms")
+    print(f"  median {statistics.median(timings) * 1000:8.1f} ms")
+    print(f"  max    {max(timings) * 1000:8.1f} ms")
+    print(f"  ingestion modules loaded: {loaded or 'none'}")
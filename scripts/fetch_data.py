@@ -1,14 +1,14 @@
 import logging
+import os
 import tarfile
 from urllib.parse import urljoin
 
-import requests
-from bs4 import BeautifulSoup
-from lxml import etree as ET
 from sqlalchemy.exc import SQLAlchemyError
 
-from src import create_app
-from src.models import Decision, db
+from src import create_app, listing, similar, suggest
+from src.compression import compress
+from src.models import Decision, DecisionBody, db
+from src.schemas import DecisionSchema
 
 logging.basicConfig(level=logging.INFO)
 
@@ -28,6 +28,10 @@ def clean_content(content_elem):
 
 def fetch_tar_urls(base_url):
     """Fetch .tar.gz URLs from the provided base URL."""
+    # Ingestion-only dependencies are imported on use to keep them out of the API
+    import requests
+    from bs4 import BeautifulSoup
+
     response = requests.get(base_url)
     soup = BeautifulSoup(response.content, "html.parser")
     tar_links = [
@@ -40,6 +44,9 @@ def fetch_tar_urls(base_url):
 
 def process_tar_file(tar_url, app):
     """Download and process a .tar.gz file containing decision XML files."""
+    import requests
+    from lxml import etree as ET
+
     decisions = []
     try:
         response = requests.get(tar_url, stream=True)
@@ -87,8 +94,8 @@ def process_tar_file(tar_url, app):
 
 def save_decisions_to_db(decisions, app):
     """Save a list of decisions to the database, avoiding duplicates."""
-    try:
-        with app.app_context():
+    with app.app_context():
+        try:
             # Avoid adding duplicate decisions
             existing_ids = set(row[0] for row in db.session.query(Decision.id).all())
             new_decisions = [
@@ -97,13 +104,14 @@ def save_decisions_to_db(decisions, app):
 
             if new_decisions:
                 db.session.bulk_insert_mappings(Decision, new_decisions)
+                listing.bump_data_version()
                 db.session.commit()
                 logging.info(f"Added {len(new_decisions)} new decisions.")
             else:
                 logging.info("No new decisions to add.")
-    except SQLAlchemyError as e:
-        logging.error(f"Database error: {e}")
-        db.session.rollback()
+        except SQLAlchemyError as e:
+            logging.error(f"Database error: {e}")
+            db.session.rollback()
 
 
 def fetch_and_store_decisions(base_url, app):
@@ -114,7 +122,105 @@ def fetch_and_store_decisions(base_url, app):
         process_tar_file(tar_url, app)  # Pass the app object to process_tar_file
 
 
+def build_suggest_index(app):
+    """Build the title/formation prefix index used by the suggest endpoint."""
+    with app.app_context():
+        titles = db.session.query(Decision.title, Decision.id).all()
+        formations = db.session.query(Decision.formation).distinct().all()
+
+        entries = [(suggest.DECISION, title, id) for title, id in titles]
+        entries += [(suggest.FORMATION, formation, None) for (formation,) in formations]
+
+        path = suggest.index_path(app)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        count = suggest.write_index(path, entries)
+        logging.info(f"Wrote {count} suggestions to {path}.")
+
+
+def build_similar_index(app, duplicate_threshold=0.9):
+    """Build the MinHash index used by the similar endpoint and flag near-duplicates."""
+    with app.app_context():
+        documents = db.session.query(Decision.id, Decision.content).yield_per(1000)
+
+        path = similar.index_path(app)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        count = similar.write_index(path, documents)
+        logging.info(f"Wrote {count} signatures to {path}.")
+
+    index = similar.SimilarityIndex(path)
+    duplicates = list(index.near_duplicates(duplicate_threshold))
+    for id, other, score in duplicates:
+        logging.warning(f"Near-duplicate decisions {id} and {other} ({score:.2f}).")
+    return duplicates
+
+
+def build_listing_summary(app):
+    """Publish the counts and page boundaries used by the listing endpoint."""
+    with app.app_context():
+        # Read the version first: rows added meanwhile make the summary stale
+        version = listing.data_version()
+        rows = (
+            db.session.query(Decision.id, Decision.formation)
+            .order_by(Decision.id)
+            .yield_per(1000)
+        )
+        page_sizes = app.config.get("LISTING_PAGE_SIZES", listing.DEFAULT_PAGE_SIZES)
+
+        path = listing.summary_path(app)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        summary = listing.write_summary(path, rows, page_sizes, version)
+        logging.info(f"Wrote listing summary {summary['version']} to {path}.")
+
+
+def store_compressed_bodies(app, batch_size=500):
+    """Store pre-compressed get_decision bodies for each missing encoding."""
+    with app.app_context():
+        level = app.config["COMPRESS_LEVEL"]
+        decision_schema = DecisionSchema(only=("content",))
+
+        # Decision id -> configured encodings it has no stored body for yet
+        missing = {}
+        for encoding in app.config["COMPRESS_ENCODINGS"]:
+            stored = db.session.query(DecisionBody.decision_id).filter_by(
+                encoding=encoding
+            )
+            for (id,) in db.session.query(Decision.id).filter(
+                Decision.id.not_in(stored)
+            ):
+                missing.setdefault(id, []).append(encoding)
+        pending = sorted(missing)
+
+        try:
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start : start + batch_size]
+                rows = []
+                for decision in Decision.query.filter(Decision.id.in_(batch)):
+                    body = app.json.response(decision_schema.dump(decision)).get_data()
+                    rows += [
+                        {
+                            "decision_id": decision.id,
+                            "encoding": encoding,
+                            "size": len(body),
+                            "body": compress(body, encoding, level),
+                        }
+                        for encoding in missing[decision.id]
+                    ]
+                db.session.bulk_insert_mappings(DecisionBody, rows)
+                db.session.commit()
+            logging.info(f"Compressed {len(pending)} decision bodies.")
+        except SQLAlchemyError as e:
+            logging.error(f"Database error: {e}")
+            db.session.rollback()
+
+
 if __name__ == "__main__":
     BASE_URL = "https://echanges.dila.gouv.fr/OPENDATA/CASS/"
     app = create_app()
+    # Create tables added since the database was initialized
+    with app.app_context():
+        db.create_all()
     fetch_and_store_decisions(BASE_URL, app)
+    build_suggest_index(app)
+    build_similar_index(app)
+    store_compressed_bodies(app)
+    build_listing_summary(app)
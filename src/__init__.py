@@ -1,9 +1,29 @@
+import gc
+
+import flask_smorest
 from dotenv import load_dotenv
-from flask import Flask
+from flask import Flask, current_app, json
 from flask_jwt_extended import JWTManager
-from flask_smorest import Api
 
+from src.compression import compression
+from src.limiter import limiter
+from src.listing import get_listing_summary
 from src.models import db
+from src.similar import get_similar_index
+from src.suggest import get_suggest_index
+
+
+class Api(flask_smorest.Api):
+    """flask-smorest Api that renders its OpenAPI document only once."""
+
+    _spec_json = None
+
+    # Overrides a private flask-smorest view, as of the 0.45.0 pinned in
+    # requirements.txt; check it still exists when upgrading
+    def _openapi_json(self):
+        if self._spec_json is None:
+            self._spec_json = json.dumps(self.spec.to_dict(), indent=2, sort_keys=False)
+        return current_app.response_class(self._spec_json, mimetype="application/json")
 
 
 def create_app(test_config=None):
@@ -16,6 +36,8 @@ def create_app(test_config=None):
         app.config.from_mapping(test_config)
 
     db.init_app(app)
+    limiter.init_app(app)
+    compression.init_app(app)
 
     api = Api(app)
     JWTManager(app)
@@ -27,3 +49,23 @@ def create_app(test_config=None):
     api.register_blueprint(decisions)
 
     return app
+
+
+def preload(app):
+    """Build the app's shared read-only structures ahead of the first request.
+
+    Called from the master process when Gunicorn runs with ``--preload``, so
+    forked workers inherit the rendered OpenAPI document, the mapped indexes
+    and the listing summary copy-on-write instead of each building their own.
+    Workers still remap an index or reload the summary once it is rebuilt.
+    """
+    with app.app_context():
+        # flask-smorest's private registry of Api instances (0.45.0, see Api)
+        for ext in app.extensions["flask-smorest"]["apis"].values():
+            ext["ext_obj"]._openapi_json()
+        get_suggest_index()
+        get_similar_index()
+        get_listing_summary()
+
+    # Keep the garbage collector from touching (and so copying) inherited pages
+    gc.freeze()
@@ -0,0 +1,109 @@
+import gzip
+import zlib
+
+from flask import Response, current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+COMPRESSIBLE_MIMETYPES = (
+    "application/json",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "application/javascript",
+)
+
+
+def compress(data, encoding, level=6):
+    """Compress ``data`` with the given content encoding."""
+    if encoding == "br":
+        return brotli.compress(data, quality=min(level, 11))
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _compress_stream(chunks, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def negotiate():
+    """Return the preferred encoding the client accepts, or ``None``."""
+    if not current_app.config["COMPRESS_ENABLED"]:
+        return None
+    return request.accept_encodings.best_match(current_app.config["COMPRESS_ENCODINGS"])
+
+
+def precompressed_response(body, encoding):
+    """Build a JSON response from a body compressed ahead of time."""
+    response = Response(body, mimetype="application/json")
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+class Compress:
+    """Compress responses according to the request's ``Accept-Encoding``."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("COMPRESS_ENABLED", True)
+        app.config.setdefault("COMPRESS_MIN_SIZE", 1024)
+        app.config.setdefault("COMPRESS_LEVEL", 6)
+        app.config.setdefault("COMPRESS_ENCODINGS", ENCODINGS)
+        app.config.setdefault("COMPRESS_PRECOMPRESSED", True)
+
+        app.after_request(self.after_request)
+
+    def after_request(self, response):
+        config = current_app.config
+        if (
+            response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or not 200 <= response.status_code < 300
+            # Compressing a byte range would corrupt it
+            or response.status_code == 206
+            or "Content-Range" in response.headers
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = negotiate()
+        if encoding is None:
+            return response
+
+        level = config["COMPRESS_LEVEL"]
+        if response.is_streamed:
+            # Only gzip can be produced incrementally with the standard library
+            if "gzip" not in config["COMPRESS_ENCODINGS"]:
+                return response
+            if not request.accept_encodings.best_match(["gzip"]):
+                return response
+            response.direct_passthrough = False
+            response.response = _compress_stream(response.response, level)
+            response.headers.pop("Content-Length", None)
+            response.headers["Content-Encoding"] = "gzip"
+            return response
+
+        data = response.get_data()
+        if len(data) < config["COMPRESS_MIN_SIZE"]:
+            return response
+
+        response.set_data(compress(data, encoding, level))
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+
+compression = Compress()
@@ -15,3 +15,19 @@ class Config:
     OPENAPI_URL_PREFIX = "/"
     OPENAPI_SWAGGER_UI_PATH = "/"
     OPENAPI_SWAGGER_UI_URL = "https://cdn.jsdelivr.net/npm/swagger-ui-dist/"
+    SUGGEST_INDEX_PATH = os.environ.get("SUGGEST_INDEX_PATH")
+    SIMILAR_INDEX_PATH = os.environ.get("SIMILAR_INDEX_PATH")
+    LISTING_SUMMARY_PATH = os.environ.get("LISTING_SUMMARY_PATH")
+    # Page sizes whose boundaries are published in the listing summary
+    LISTING_PAGE_SIZES = (5, 10, 20, 50)
+    COMPRESS_ENABLED = os.environ.get("COMPRESS_ENABLED", "true").lower() == "true"
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
+    RATELIMIT_ENABLED = os.environ.get("RATELIMIT_ENABLED", "true").lower() == "true"
+    # "sqlite" shares budgets and concurrency slots across Gunicorn workers;
+    # "memory" keeps them per worker, where the concurrency cap cannot trigger
+    # with synchronous workers since each handles one request at a time
+    RATELIMIT_BACKEND = os.environ.get("RATELIMIT_BACKEND", "sqlite")
+    RATELIMIT_STORAGE_PATH = os.environ.get("RATELIMIT_STORAGE_PATH")
+    RATELIMIT_CONCURRENCY = int(os.environ.get("RATELIMIT_CONCURRENCY", 4))
+    # Seconds after which a slot left by a killed worker is reclaimed
+    RATELIMIT_SLOT_TTL = int(os.environ.get("RATELIMIT_SLOT_TTL", 300))
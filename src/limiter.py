@@ -0,0 +1,246 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from flask import current_app
+from flask_jwt_extended import get_jwt_identity
+from flask_smorest import abort
+
+DEFAULT_BUDGETS = {
+    # name: (bucket capacity, tokens refilled per second)
+    "search": (10, 0.5),
+    "listing": (60, 2.0),
+    "export": (30, 1.0),
+    "suggest": (120, 10.0),
+    "similar": (30, 1.0),
+}
+
+
+def _draw(tokens, updated, capacity, rate, now):
+    """Refill a bucket and draw one token, returning ``(tokens, wait)``.
+
+    ``wait`` is 0 when a token was drawn, else the seconds until the next one.
+    """
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens < 1:
+        return tokens, (1 - tokens) / rate
+    return tokens - 1, 0
+
+
+class MemoryBackend:
+    """Token buckets and concurrency slots kept in the current process.
+
+    Slots only count requests handled by this process, so with synchronous
+    workers they cap nothing beyond one request per worker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._active = {}
+
+    def admit(self, slot_key, limit, bucket_key, capacity, rate, now):
+        """Take a concurrency slot, then a token from the bucket.
+
+        Returns ``(slot, wait)``. ``slot`` is the token to pass to ``release``,
+        or ``None`` when the request is rejected: ``wait`` is then the seconds
+        until the bucket refills, or 0 when the concurrency cap is reached, in
+        which case no token is drawn.
+        """
+        with self._lock:
+            if self._active.get(slot_key, 0) >= limit:
+                return None, 0
+            tokens, updated = self._buckets.get(bucket_key, (capacity, now))
+            tokens, wait = _draw(tokens, updated, capacity, rate, now)
+            self._buckets[bucket_key] = (tokens, now)
+            if wait:
+                return None, wait
+            self._active[slot_key] = self._active.get(slot_key, 0) + 1
+            return slot_key, 0
+
+    def release(self, slot):
+        with self._lock:
+            remaining = self._active.get(slot, 0) - 1
+            if remaining > 0:
+                self._active[slot] = remaining
+            else:
+                self._active.pop(slot, None)
+
+
+class SQLiteBackend:
+    """Token buckets and concurrency slots shared by every worker on the host.
+
+    Each process keeps one connection, opened on first use so it is never
+    shared across a fork. A request costs two short write transactions:
+    ``admit`` and ``release``.
+
+    Each slot records the pid of the worker holding it, so slots left behind
+    by a killed worker are reclaimed once that process is gone or after
+    ``slot_ttl`` seconds, whichever comes first.
+    """
+
+    def __init__(self, path, slot_ttl=300):
+        self.path = path
+        self.slot_ttl = slot_ttl
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets "
+                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS slots (id INTEGER PRIMARY KEY, "
+                "key TEXT NOT NULL, pid INTEGER NOT NULL, started REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS slots_key ON slots (key)")
+
+    @contextmanager
+    def _transaction(self):
+        """Run a write-locked transaction on this process's connection."""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._conn = sqlite3.connect(
+                    self.path, timeout=5, isolation_level=None, check_same_thread=False
+                )
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                # WAL stays consistent without syncing every commit to disk
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._pid = os.getpid()
+
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def admit(self, slot_key, limit, bucket_key, capacity, rate, now):
+        """Same as ``MemoryBackend.admit``, in a single transaction."""
+        with self._transaction() as conn:
+            slots = conn.execute(
+                "SELECT id, pid, started FROM slots WHERE key = ?", (slot_key,)
+            ).fetchall()
+            stale = [
+                (id,)
+                for id, pid, started in slots
+                if started < now - self.slot_ttl or not _is_running(pid)
+            ]
+            conn.executemany("DELETE FROM slots WHERE id = ?", stale)
+            if len(slots) - len(stale) >= limit:
+                return None, 0
+
+            row = conn.execute(
+                "SELECT tokens, updated FROM buckets WHERE key = ?", (bucket_key,)
+            ).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens, wait = _draw(tokens, updated, capacity, rate, now)
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated) "
+                "VALUES (?, ?, ?)",
+                (bucket_key, tokens, now),
+            )
+            if wait:
+                return None, wait
+
+            slot = conn.execute(
+                "INSERT INTO slots (key, pid, started) VALUES (?, ?, ?)",
+                (slot_key, os.getpid(), now),
+            ).lastrowid
+            return slot, 0
+
+    def release(self, slot):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM slots WHERE id = ?", (slot,))
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class RateLimiter:
+    """Per-identity token buckets and concurrency caps for the API endpoints."""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("RATELIMIT_ENABLED", True)
+        app.config.setdefault("RATELIMIT_BACKEND", "memory")
+        app.config.setdefault("RATELIMIT_STORAGE_PATH", None)
+        app.config.setdefault("RATELIMIT_BUDGETS", DEFAULT_BUDGETS)
+        app.config.setdefault("RATELIMIT_CONCURRENCY", 4)
+        app.config.setdefault("RATELIMIT_SLOT_TTL", 300)
+
+        if app.config["RATELIMIT_BACKEND"] == "sqlite":
+            path = app.config["RATELIMIT_STORAGE_PATH"] or os.path.join(
+                app.instance_path, "ratelimit.db"
+            )
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            backend = SQLiteBackend(path, app.config["RATELIMIT_SLOT_TTL"])
+        else:
+            backend = MemoryBackend()
+
+        app.extensions["limiter"] = backend
+
+    def limit(self, budget):
+        """Decorate a view so each JWT identity draws from the named budget.
+
+        Must be applied below ``jwt_required`` so the identity is available.
+        """
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                config = current_app.config
+                if not config["RATELIMIT_ENABLED"]:
+                    return view(*args, **kwargs)
+
+                backend = current_app.extensions["limiter"]
+                identity = get_jwt_identity()
+                capacity, rate = config["RATELIMIT_BUDGETS"][budget]
+
+                slot, wait = backend.admit(
+                    f"active:{identity}",
+                    config["RATELIMIT_CONCURRENCY"],
+                    f"{budget}:{identity}",
+                    capacity,
+                    rate,
+                    time.time(),
+                )
+                if slot is None and wait:
+                    abort(
+                        429,
+                        message=f"Rate limit exceeded for {budget}.",
+                        headers={"Retry-After": str(math.ceil(wait))},
+                    )
+                if slot is None:
+                    abort(
+                        429,
+                        message="Too many concurrent requests.",
+                        headers={"Retry-After": "1"},
+                    )
+                try:
+                    return view(*args, **kwargs)
+                finally:
+                    backend.release(slot)
+
+            return wrapper
+
+        return decorator
+
+
+limiter = RateLimiter()
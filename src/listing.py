@@ -0,0 +1,123 @@
+import json
+import math
+import os
+
+from flask import current_app
+
+from src.models import DataVersion, db
+
+FORMAT = 1
+ALL = ""
+DEFAULT_PAGE_SIZES = (5, 10, 20, 50)
+
+
+def data_version():
+    """Return the version of the decisions table, bumped by each ingestion."""
+    return db.session.query(DataVersion.version).filter_by(id=1).scalar() or 0
+
+
+def bump_data_version():
+    """Mark the decisions table as changed, in the caller's transaction."""
+    row = db.session.get(DataVersion, 1)
+    if row is None:
+        db.session.add(DataVersion(id=1, version=1))
+    else:
+        row.version += 1
+
+
+def write_summary(path, rows, page_sizes, version):
+    """Write the listing summary for ``(id, formation)`` rows sorted by id.
+
+    For the unfiltered listing and each formation it records the total count
+    and the id starting every ``step`` rows, ``step`` being the greatest
+    common divisor of ``page_sizes``, which locates the first row of any
+    page for any of those sizes. ``version`` is the ``data_version`` the
+    rows were read at, so readers can tell when the summary is out of date.
+    Written to a temporary file first so running workers keep their current
+    summary.
+    """
+    step = math.gcd(*page_sizes)
+    listings = {}
+    for id, formation in rows:
+        for key in {ALL, formation or ALL}:
+            listing = listings.setdefault(key, {"total": 0, "boundaries": []})
+            if listing["total"] % step == 0:
+                listing["boundaries"].append(id)
+            listing["total"] += 1
+
+    summary = {
+        "format": FORMAT,
+        "version": version,
+        "page_sizes": sorted(page_sizes),
+        "step": step,
+        "listings": listings,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(summary, f)
+    os.replace(tmp_path, path)
+
+    return summary
+
+
+class ListingSummary:
+    """Precomputed counts and page boundaries published by ingestion."""
+
+    def __init__(self, path):
+        self.mtime = os.stat(path).st_mtime_ns
+        with open(path) as f:
+            summary = json.load(f)
+        if summary.get("format") != FORMAT:
+            raise ValueError(f"{path} is not a compatible listing summary.")
+
+        self.version = summary["version"]
+        self.page_sizes = frozenset(summary["page_sizes"])
+        self._step = summary["step"]
+        self._listings = summary["listings"]
+
+    def total(self, formation=None):
+        listing = self._listings.get(formation or ALL)
+        return listing["total"] if listing else 0
+
+    def page_start(self, page, per_page, formation=None):
+        """Return the id of the first row of ``page``, or ``None`` past the end."""
+        listing = self._listings.get(formation or ALL)
+        index = (page - 1) * per_page // self._step
+        if not listing or not 0 <= index < len(listing["boundaries"]):
+            return None
+        return listing["boundaries"][index]
+
+
+def summary_path(app):
+    return app.config.get("LISTING_SUMMARY_PATH") or os.path.join(
+        app.instance_path, "listing.json"
+    )
+
+
+def get_listing_summary():
+    """Return the current app's listing summary, reloading it when republished.
+
+    Returns ``None`` when no summary has been published yet.
+    """
+    path = summary_path(current_app)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    summary = current_app.extensions.get("listing_summary")
+    if summary is None or summary.mtime != mtime:
+        summary = current_app.extensions["listing_summary"] = ListingSummary(path)
+    return summary
+
+
+def get_current_listing_summary():
+    """Return the listing summary if it matches the decisions table, else ``None``.
+
+    Ingestion commits decisions before it republishes the summary, so in
+    between the summary is stale and listings must be answered live.
+    """
+    summary = get_listing_summary()
+    if summary is None or summary.version != data_version():
+        return None
+    return summary
@@ -26,3 +26,25 @@ class Decision(db.Model):
 
     def __repr__(self):
         return f"Decision: {self.id}"
+
+
+class DecisionBody(db.Model):
+    __tablename__ = "decision_bodies"
+    decision_id = db.Column(db.String, db.ForeignKey("decisions.id"), primary_key=True)
+    encoding = db.Column(db.String(16), primary_key=True)
+    size = db.Column(db.Integer, nullable=False)  # uncompressed length in bytes
+    body = db.Column(db.LargeBinary, nullable=False)
+
+    def __repr__(self):
+        return f"DecisionBody: {self.decision_id} ({self.encoding})"
+
+
+class DataVersion(db.Model):
+    """Single-row counter bumped whenever ingestion adds decisions."""
+
+    __tablename__ = "data_version"
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"DataVersion: {self.version}"
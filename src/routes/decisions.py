@@ -1,11 +1,19 @@
-from flask import request
+import math
+
+from flask import current_app, request
 from flask.json import jsonify
 from flask_jwt_extended import jwt_required
 from flask_smorest import Blueprint, abort
 
-from src.models import Decision
+from src.compression import negotiate, precompressed_response
+from src.limiter import limiter
+from src.listing import get_current_listing_summary
+from src.models import Decision, DecisionBody
 from src.schemas import (DecisionSchema, FilteredPaginationSchema,
-                         SearchQuerySchema)
+                         SearchQuerySchema, SimilarQuerySchema,
+                         SuggestQuerySchema)
+from src.similar import get_similar_index
+from src.suggest import get_suggest_index
 
 decisions = Blueprint(
     "decisions",
@@ -23,7 +31,9 @@ decisions = Blueprint(
     description="A paginated list of decisions",
 )
 @decisions.response(401, description="Unauthorized - JWT token is missing or invalid")
+@decisions.response(429, description="Too many requests - retry after the given delay")
 @jwt_required()
+@limiter.limit("listing")
 def get_decisions(args):
     """
     Get a paginated list of decisions.
@@ -40,24 +50,51 @@ def get_decisions(args):
 
     query = Decision.query.with_entities(
         Decision.id, Decision.title, Decision.formation
-    )
+    ).order_by(Decision.id)
     if formation:
         query = query.filter_by(formation=formation)
 
-    decisions_paginated = query.paginate(page=page, per_page=per_page)
-
     decision_schema = DecisionSchema(many=True)
-    data = decision_schema.dump(decisions_paginated.items)
+    summary = get_current_listing_summary()
+
+    if summary is None or per_page not in summary.page_sizes:
+        decisions_paginated = query.paginate(page=page, per_page=per_page)
+        data = decision_schema.dump(decisions_paginated.items)
+
+        # Build the pagination metadata
+        meta = {
+            "page": decisions_paginated.page,
+            "pages": decisions_paginated.pages,
+            "total_count": decisions_paginated.total,
+            "prev_page": decisions_paginated.prev_num,
+            "next_page": decisions_paginated.next_num,
+            "has_next": decisions_paginated.has_next,
+            "has_prev": decisions_paginated.has_prev,
+        }
+        return jsonify({"data": data, "meta": meta})
+
+    # Standard page sizes are answered from the summary published at ingestion,
+    # as long as it is current: no COUNT(*), and the page starts at a known id
+    # instead of an OFFSET scan
+    total = summary.total(formation)
+    pages = math.ceil(total / per_page)
+    if page < 1 or (page > pages and page != 1):
+        abort(404)
+
+    start_id = summary.page_start(page, per_page, formation)
+    items = []
+    if start_id is not None:
+        items = query.filter(Decision.id >= start_id).limit(per_page).all()
+    data = decision_schema.dump(items)
 
-    # Build the pagination metadata
     meta = {
-        "page": decisions_paginated.page,
-        "pages": decisions_paginated.pages,
-        "total_count": decisions_paginated.total,
-        "prev_page": decisions_paginated.prev_num,
-        "next_page": decisions_paginated.next_num,
-        "has_next": decisions_paginated.has_next,
-        "has_prev": decisions_paginated.has_prev,
+        "page": page,
+        "pages": pages,
+        "total_count": total,
+        "prev_page": page - 1 if page > 1 else None,
+        "next_page": page + 1 if page < pages else None,
+        "has_next": page < pages,
+        "has_prev": page > 1,
     }
 
     return jsonify({"data": data, "meta": meta})
@@ -65,11 +102,24 @@ def get_decisions(args):
 
 @decisions.get("/<string:id>")
 @decisions.response(200, example={"content": "string"})
+@decisions.response(429, description="Too many requests - retry after the given delay")
 @jwt_required()
+@limiter.limit("export")
 def get_decision(id):
     """
     Restore the original response structure.
     """
+    # Decisions never change, so serve the body compressed at ingestion if any
+    encoding = negotiate() if current_app.config["COMPRESS_PRECOMPRESSED"] else None
+    if encoding:
+        stored = (
+            DecisionBody.query.filter_by(decision_id=id, encoding=encoding)
+            .filter(DecisionBody.size >= current_app.config["COMPRESS_MIN_SIZE"])
+            .first()
+        )
+        if stored:
+            return precompressed_response(stored.body, encoding)
+
     decision = Decision.query.filter_by(id=id).first()
 
     if not decision:
@@ -82,6 +132,60 @@ def get_decision(id):
     return serialized_decision, 200
 
 
+@decisions.get("/<string:id>/similar")
+@decisions.arguments(SimilarQuerySchema, location="query")
+@decisions.response(
+    200,
+    example={
+        "data": [
+            {"id": "string", "title": "string", "formation": "string", "score": 0.5}
+        ]
+    },
+    description="Decisions whose content is closest to the given decision",
+)
+@decisions.response(401, description="Unauthorized - JWT token is missing or invalid")
+@decisions.response(404, description="Decision not found in the similarity index")
+@decisions.response(429, description="Too many requests - retry after the given delay")
+@decisions.response(503, description="The similarity index has not been built yet")
+@jwt_required()
+@limiter.limit("similar")
+def get_similar_decisions(args, id):
+    """
+    Get decisions similar to a given decision.
+    ---
+    This endpoint looks up the MinHash signature computed at ingestion time and returns
+    the closest decisions, scored by estimated Jaccard similarity of their content.
+    Query Parameters:
+      - limit: Maximum number of similar decisions (default: 10).
+    """
+    index = get_similar_index()
+    if index is None:
+        abort(503, message="Similarity index is not available.")
+
+    similar = index.similar(id, limit=args["limit"])
+    if similar is None:
+        return {"message": "Decision not found", "id": id}, 404
+
+    scores = dict(similar)
+    rows = (
+        Decision.query.with_entities(Decision.id, Decision.title, Decision.formation)
+        .filter(Decision.id.in_(scores))
+        .all()
+    )
+    data = [
+        {
+            "id": row.id,
+            "title": row.title,
+            "formation": row.formation,
+            "score": round(scores[row.id], 3),
+        }
+        for row in rows
+    ]
+    data_sorted = sorted(data, key=lambda x: x["score"], reverse=True)
+
+    return jsonify({"data": data_sorted})
+
+
 @decisions.get("/search")
 @decisions.arguments(SearchQuerySchema, location="query")
 @decisions.response(
@@ -95,7 +199,9 @@ def get_decision(id):
     description="A list of decisions matching the search query",
 )
 @decisions.response(401, description="Unauthorized - JWT token is missing or invalid")
+@decisions.response(429, description="Too many requests - retry after the given delay")
 @jwt_required()
+@limiter.limit("search")
 def search_decisions(args):
     """
     Search decisions by title or content.
@@ -158,3 +264,36 @@ def search_decisions(args):
     }
 
     return jsonify({"data": paginated_data, "meta": meta})
+
+
+@decisions.get("/suggest")
+@decisions.arguments(SuggestQuerySchema, location="query")
+@decisions.response(
+    200,
+    example={"data": [{"id": "string", "title": "string", "type": "decision"}]},
+    description="Titles and formations starting with the given prefix",
+)
+@decisions.response(401, description="Unauthorized - JWT token is missing or invalid")
+@decisions.response(429, description="Too many requests - retry after the given delay")
+@decisions.response(503, description="The suggestion index has not been built yet")
+@jwt_required()
+@limiter.limit("suggest")
+def suggest_decisions(args):
+    """
+    Suggest decision titles and formations.
+    ---
+    This endpoint autocompletes a title prefix from the index built at ingestion time,
+    without querying the database. Matching ignores case and accents.
+    Query Parameters:
+      - prefix: Beginning of a title or formation.
+      - limit: Maximum number of suggestions (default: 10).
+    """
+    prefix = args["prefix"]
+    if not prefix.strip():
+        return jsonify({"data": []})
+
+    index = get_suggest_index()
+    if index is None:
+        abort(503, message="Suggestion index is not available.")
+
+    return jsonify({"data": index.lookup(prefix, limit=args["limit"])})
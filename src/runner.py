@@ -1,3 +1,4 @@
-from src import create_app
+from src import create_app, preload
 
 app = create_app()
+preload(app)
@@ -42,3 +42,22 @@ class FilteredPaginationSchema(PaginationSchema):
 
 class SearchQuerySchema(PaginationSchema):
     q = fields.String(required=False, description="The search query string.")
+
+
+class SuggestQuerySchema(Schema):
+    prefix = fields.String(required=True, description="Beginning of a title.")
+    limit = fields.Integer(
+        required=False,
+        missing=10,
+        validate=validate.Range(min=1, max=50),
+        description="Maximum number of suggestions (default: 10).",
+    )
+
+
+class SimilarQuerySchema(Schema):
+    limit = fields.Integer(
+        required=False,
+        missing=10,
+        validate=validate.Range(min=1, max=50),
+        description="Maximum number of similar decisions (default: 10).",
+    )
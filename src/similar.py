@@ -0,0 +1,230 @@
+import hashlib
+import mmap
+import os
+import re
+import struct
+import zlib
+from array import array
+
+from flask import current_app
+
+from src.suggest import file_stat, normalize
+
+MAGIC = b"CASSIMI2"
+NUM_HASHES = 64
+BANDS = 16
+SHINGLE_SIZE = 3
+EMPTY = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<8sIHH")
+_HASH = struct.Struct("<I")
+_BUCKET = struct.Struct("<QI")
+_OFFSET = struct.Struct("<I")
+
+
+def signature(text):
+    """Return the MinHash signature of the word shingles of ``text``.
+
+    Uses one-permutation hashing: each shingle is hashed once and the hash
+    picks the bin it competes for, which keeps ingestion linear in the
+    length of the document.
+    """
+    words = re.findall(r"\w+", normalize(text or ""))
+    size = min(SHINGLE_SIZE, len(words)) or 1
+    sig = array("I", [EMPTY]) * NUM_HASHES
+    for i in range(max(len(words) - size + 1, 0)):
+        h = zlib.crc32(" ".join(words[i : i + size]).encode())
+        b, value = h % NUM_HASHES, h // NUM_HASHES
+        if value < sig[b]:
+            sig[b] = value
+    return sig
+
+
+def similarity(a, b):
+    """Estimate the Jaccard similarity of two signatures."""
+    filled = equal = 0
+    for x, y in zip(a, b):
+        if x == EMPTY and y == EMPTY:
+            continue
+        filled += 1
+        equal += x == y
+    return equal / filled if filled else 0.0
+
+
+def _band_hash(sig, band):
+    """Hash one band of ``sig``, or return ``None`` when all its bins are empty.
+
+    Empty bands carry no information and would put every short or empty
+    document in the same bucket.
+    """
+    rows = NUM_HASHES // BANDS
+    values = sig[band * rows : (band + 1) * rows]
+    if all(value == EMPTY for value in values):
+        return None
+    data = values.tobytes()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def write_index(path, documents):
+    """Write signatures and LSH buckets for ``(id, content)`` documents to ``path``.
+
+    Rows are sorted by id so lookups can binary search them, and each band
+    stores its ``(bucket hash, row)`` pairs sorted by hash, skipping empty
+    bands, so candidates are found without loading the file. Written to a
+    temporary file first so running workers keep reading their current
+    mapping.
+    """
+    rows = sorted((id, signature(content)) for id, content in documents)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(rows), NUM_HASHES, BANDS))
+        for _, sig in rows:
+            f.write(sig.tobytes())
+
+        bands = []
+        for band in range(BANDS):
+            hashes = ((_band_hash(sig, band), row) for row, (_, sig) in enumerate(rows))
+            bands.append(sorted(bucket for bucket in hashes if bucket[0] is not None))
+        for buckets in bands:
+            f.write(_OFFSET.pack(len(buckets)))
+        for buckets in bands:
+            for bucket in buckets:
+                f.write(_BUCKET.pack(*bucket))
+
+        ids = [id.encode() for id, _ in rows]
+        offset = 0
+        for id in ids:
+            f.write(_OFFSET.pack(offset))
+            offset += len(id)
+        f.write(_OFFSET.pack(offset))
+        f.write(b"".join(ids))
+    os.replace(tmp_path, path)
+
+    return len(rows)
+
+
+class SimilarityIndex:
+    """Read-only, memory-mapped view of an index built by ``write_index``."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.stat = file_stat(os.fstat(f.fileno()))
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, num_hashes, bands = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or (num_hashes, bands) != (NUM_HASHES, BANDS):
+            raise ValueError(f"{path} is not a compatible similarity index.")
+
+        self._sig_size = _HASH.size * NUM_HASHES
+        counts = _HEADER.size + self._sig_size * self._count
+        self._band_counts = struct.unpack_from(f"<{BANDS}I", self._buf, counts)
+        self._band_starts = []
+        start = counts + _OFFSET.size * BANDS
+        for count in self._band_counts:
+            self._band_starts.append(start)
+            start += _BUCKET.size * count
+        self._offsets = start
+        self._ids = self._offsets + _OFFSET.size * (self._count + 1)
+
+    def __len__(self):
+        return self._count
+
+    def _id(self, row):
+        start, end = struct.unpack_from(
+            "<II", self._buf, self._offsets + _OFFSET.size * row
+        )
+        return self._buf[self._ids + start : self._ids + end].decode()
+
+    def _row(self, id):
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._id(mid) < id:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._id(lo) == id:
+            return lo
+        return None
+
+    def _signature(self, row):
+        start = _HEADER.size + self._sig_size * row
+        return array("I", self._buf[start : start + self._sig_size])
+
+    def _bucket(self, band, i):
+        pos = self._band_starts[band] + _BUCKET.size * i
+        return _BUCKET.unpack_from(self._buf, pos)
+
+    def _candidates(self, sig, row, max_candidates):
+        candidates = set()
+        for band in range(BANDS):
+            h = _band_hash(sig, band)
+            if h is None:
+                continue
+            count = self._band_counts[band]
+            lo, hi = 0, count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self._bucket(band, mid)[0] < h:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            for i in range(lo, count):
+                bucket_hash, other = self._bucket(band, i)
+                if bucket_hash != h or len(candidates) >= max_candidates:
+                    break
+                if other != row:
+                    candidates.add(other)
+        return candidates
+
+    def similar(self, id, limit=10, threshold=0.0, max_candidates=500):
+        """Return ``(id, score)`` pairs most similar to decision ``id``.
+
+        Candidates sharing no shingle with ``id`` are never returned, whatever
+        the ``threshold``. Returns ``None`` when ``id`` is not in the index.
+        """
+        row = self._row(id)
+        if row is None:
+            return None
+
+        sig = self._signature(row)
+        scored = []
+        for other in self._candidates(sig, row, max_candidates):
+            score = similarity(sig, self._signature(other))
+            if score > 0 and score >= threshold:
+                scored.append((self._id(other), score))
+        scored.sort(key=lambda pair: (-pair[1], pair[0]))
+        return scored[:limit]
+
+    def near_duplicates(self, threshold=0.9):
+        """Yield ``(id, other_id, score)`` for each pair above ``threshold``."""
+        for row in range(self._count):
+            id = self._id(row)
+            for other, score in self.similar(id, limit=None, threshold=threshold):
+                if id < other:
+                    yield id, other, score
+
+
+def index_path(app):
+    return app.config.get("SIMILAR_INDEX_PATH") or os.path.join(
+        app.instance_path, "similar.idx"
+    )
+
+
+def get_similar_index():
+    """Return the current app's similarity index, remapping it when rebuilt.
+
+    Ingestion swaps in a new file, so a mapping inherited from the Gunicorn
+    master would otherwise serve the old index for good. Returns ``None``
+    when no index has been built yet.
+    """
+    path = index_path(current_app)
+    try:
+        stat = file_stat(os.stat(path))
+    except FileNotFoundError:
+        return None
+
+    index = current_app.extensions.get("similar_index")
+    if index is None or index.stat != stat:
+        index = current_app.extensions["similar_index"] = SimilarityIndex(path)
+    return index
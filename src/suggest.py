@@ -0,0 +1,148 @@
+import mmap
+import os
+import re
+import struct
+import unicodedata
+
+from flask import current_app
+
+MAGIC = b"CASSUGG1"
+DECISION = 0
+FORMATION = 1
+KINDS = {DECISION: "decision", FORMATION: "formation"}
+
+_HEADER = struct.Struct("<8sI")
+_OFFSET = struct.Struct("<I")
+_KIND = struct.Struct("<B")
+_LENGTH = struct.Struct("<H")
+
+
+def normalize(text):
+    """Lowercase, strip accents and collapse whitespace for prefix matching."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", stripped).lstrip().lower()
+
+
+def _field(value):
+    data = value.encode()[:0xFFFF]
+    return _LENGTH.pack(len(data)) + data
+
+
+def write_index(path, entries):
+    """Write a prefix index for ``(kind, text, id)`` entries to ``path``.
+
+    The file holds a header, a table of record offsets and the records
+    themselves, sorted by normalized text so lookups can binary search the
+    memory-mapped file without loading it. It is written to a temporary file
+    first so running workers keep reading their current mapping.
+    """
+    records = sorted(
+        (normalize(text).encode()[:0xFFFF], kind, text, id or "")
+        for kind, text, id in entries
+        if text
+    )
+
+    offsets = []
+    blob = bytearray()
+    for key, kind, text, id in records:
+        offsets.append(len(blob))
+        blob += _KIND.pack(kind)
+        blob += _LENGTH.pack(len(key)) + key
+        blob += _field(text) + _field(id)
+
+    base = _HEADER.size + _OFFSET.size * len(offsets)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(offsets)))
+        for offset in offsets:
+            f.write(_OFFSET.pack(base + offset))
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+    return len(records)
+
+
+class PrefixIndex:
+    """Read-only, memory-mapped view of an index built by ``write_index``."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.stat = file_stat(os.fstat(f.fileno()))
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a suggestion index.")
+
+    def __len__(self):
+        return self._count
+
+    def _offset(self, i):
+        return _OFFSET.unpack_from(self._buf, _HEADER.size + _OFFSET.size * i)[0]
+
+    def _read(self, pos):
+        (length,) = _LENGTH.unpack_from(self._buf, pos)
+        pos += _LENGTH.size
+        return self._buf[pos : pos + length], pos + length
+
+    def _key(self, i):
+        return self._read(self._offset(i) + _KIND.size)[0]
+
+    def _record(self, i):
+        pos = self._offset(i)
+        (kind,) = _KIND.unpack_from(self._buf, pos)
+        key, pos = self._read(pos + _KIND.size)
+        text, pos = self._read(pos)
+        id, _ = self._read(pos)
+        return key, kind, text.decode(errors="ignore"), id.decode() or None
+
+    def lookup(self, prefix, limit=10):
+        """Return up to ``limit`` entries whose normalized text starts with ``prefix``."""
+        needle = normalize(prefix).encode()
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < needle:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        results = []
+        for i in range(lo, self._count):
+            if len(results) >= limit:
+                break
+            key, kind, text, id = self._record(i)
+            if not key.startswith(needle):
+                break
+            results.append({"id": id, "title": text, "type": KINDS[kind]})
+        return results
+
+
+def file_stat(stat):
+    """Identify a version of an index file: rebuilds change inode and mtime."""
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def index_path(app):
+    return app.config.get("SUGGEST_INDEX_PATH") or os.path.join(
+        app.instance_path, "suggest.idx"
+    )
+
+
+def get_suggest_index():
+    """Return the current app's suggestion index, remapping it when rebuilt.
+
+    Ingestion swaps in a new file, so a mapping inherited from the Gunicorn
+    master would otherwise serve the old index for good. Returns ``None``
+    when no index has been built yet.
+    """
+    path = index_path(current_app)
+    try:
+        stat = file_stat(os.stat(path))
+    except FileNotFoundError:
+        return None
+
+    index = current_app.extensions.get("suggest_index")
+    if index is None or index.stat != stat:
+        index = current_app.extensions["suggest_index"] = PrefixIndex(path)
+    return index
@@ -1,6 +1,7 @@
 from unittest.mock import Mock, patch
 
 import pytest
+from flask_jwt_extended import create_access_token
 
 from src import create_app
 from src.models import db
@@ -44,3 +45,10 @@ def mock_requests():
     """Fixture to mock requests.get."""
     with patch("requests.get") as mock_get:
         yield mock_get
+
+
+@pytest.fixture
+def auth_headers(app):
+    """Authorization headers carrying a valid access token."""
+    token = create_access_token(identity="1")
+    return {"Authorization": f"Bearer {token}"}
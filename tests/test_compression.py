@@ -0,0 +1,116 @@
+import gzip
+
+from flask import Response
+
+from src.models import Decision, DecisionBody, db
+
+CONTENT = "La Cour de cassation rejette le pourvoi. " * 100
+
+
+def add_decision(id="1", content=CONTENT):
+    db.session.add(Decision(id=id, title="Test", formation="A", content=content))
+    db.session.commit()
+
+
+def test_large_response_compressed(client, auth_headers):
+    add_decision()
+
+    response = client.get(
+        "/api/v1/decisions/1", headers={**auth_headers, "Accept-Encoding": "gzip"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert b"rejette le pourvoi" in gzip.decompress(response.data)
+
+
+def test_compression_negotiation(app, client, auth_headers):
+    add_decision()
+    add_decision(id="2", content="Court")
+
+    response = client.get("/api/v1/decisions/1", headers=auth_headers)
+    assert "Content-Encoding" not in response.headers
+
+    response = client.get(
+        "/api/v1/decisions/1", headers={**auth_headers, "Accept-Encoding": "gzip;q=0"}
+    )
+    assert "Content-Encoding" not in response.headers
+
+    # Payloads under the threshold are sent as is
+    response = client.get(
+        "/api/v1/decisions/2", headers={**auth_headers, "Accept-Encoding": "gzip"}
+    )
+    assert "Content-Encoding" not in response.headers
+
+    app.config["COMPRESS_ENABLED"] = False
+    response = client.get(
+        "/api/v1/decisions/1", headers={**auth_headers, "Accept-Encoding": "gzip"}
+    )
+    assert "Content-Encoding" not in response.headers
+
+
+def add_body(id, body):
+    db.session.add(
+        DecisionBody(
+            decision_id=id, encoding="gzip", size=len(body), body=gzip.compress(body)
+        )
+    )
+    db.session.commit()
+
+
+def test_precompressed_body_served(client, auth_headers):
+    add_decision()
+    add_body("1", b'{"content":"' + b"x" * 2000 + b'"}')
+
+    response = client.get(
+        "/api/v1/decisions/1", headers={**auth_headers, "Accept-Encoding": "gzip"}
+    )
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == b'{"content":"' + b"x" * 2000 + b'"}'
+
+
+def test_small_precompressed_body_skipped(client, auth_headers):
+    add_decision(content="x")
+    add_body("1", b'{"content":"x"}')
+
+    response = client.get(
+        "/api/v1/decisions/1", headers={**auth_headers, "Accept-Encoding": "gzip"}
+    )
+
+    assert "Content-Encoding" not in response.headers
+    assert response.json == {"content": "x"}
+
+
+def test_partial_content_not_compressed(app, client):
+    @app.get("/range")
+    def partial():
+        return Response(
+            CONTENT,
+            status=206,
+            mimetype="text/plain",
+            headers={"Content-Range": f"bytes 0-{len(CONTENT) - 1}/10000"},
+        )
+
+    response = client.get("/range", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in response.headers
+    assert response.data == CONTENT.encode()
+
+
+def test_streamed_response_compressed(app, client):
+    @app.get("/stream")
+    def stream():
+        return Response((CONTENT for _ in range(3)), mimetype="application/json")
+
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert gzip.decompress(response.data) == (CONTENT * 3).encode()
+
+    app.config["COMPRESS_ENCODINGS"] = ("br",)
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip, br"})
+    assert "Content-Encoding" not in response.headers
+    assert response.data == (CONTENT * 3).encode()
@@ -1,3 +1,5 @@
+import gzip
+import json
 import tarfile
 from io import BytesIO
 from unittest.mock import Mock
@@ -5,13 +7,20 @@ from unittest.mock import Mock
 from lxml import etree as ET
 
 from scripts.fetch_data import (
+    build_listing_summary,
+    build_similar_index,
+    build_suggest_index,
     clean_content,
     fetch_and_store_decisions,
     fetch_tar_urls,
     process_tar_file,
     save_decisions_to_db,
+    store_compressed_bodies,
 )
-from src.models import Decision, db
+from src.listing import ListingSummary
+from src.models import DataVersion, Decision, DecisionBody, db
+from src.similar import SimilarityIndex
+from src.suggest import PrefixIndex
 
 
 def test_fetch_tar_urls(mock_requests):
@@ -210,3 +219,96 @@ def test_fetch_and_store_decisions(mock_requests, app):
         assert decision.title == "Test Decision"
         assert decision.formation == "Formation A"
         assert decision.content == "Test content"
+
+
+def test_build_suggest_index(app, tmp_path):
+    app.config["SUGGEST_INDEX_PATH"] = str(tmp_path / "suggest.idx")
+    with app.app_context():
+        db.session.add(
+            Decision(id="1", title="Test Decision", formation="Formation A", content="")
+        )
+        db.session.commit()
+
+    build_suggest_index(app)
+
+    index = PrefixIndex(str(tmp_path / "suggest.idx"))
+    assert index.lookup("test")[0]["id"] == "1"
+    assert index.lookup("formation")[0]["type"] == "formation"
+
+
+def test_build_similar_index(app, tmp_path):
+    app.config["SIMILAR_INDEX_PATH"] = str(tmp_path / "similar.idx")
+    content = "Le pourvoi formé contre l'arrêt de la cour d'appel est rejeté"
+    with app.app_context():
+        db.session.add(Decision(id="1", title="A", formation="B", content=content))
+        db.session.add(Decision(id="2", title="C", formation="B", content=content))
+        db.session.commit()
+
+    duplicates = build_similar_index(app)
+
+    assert duplicates == [("1", "2", 1.0)]
+    index = SimilarityIndex(str(tmp_path / "similar.idx"))
+    assert index.similar("1") == [("2", 1.0)]
+
+
+def test_store_compressed_bodies(app):
+    with app.app_context():
+        db.session.add(Decision(id="1", title="A", formation="B", content="Content"))
+        db.session.commit()
+
+        store_compressed_bodies(app)
+        store_compressed_bodies(app)
+
+        stored = DecisionBody.query.filter_by(decision_id="1", encoding="gzip").all()
+        assert len(stored) == 1
+        assert json.loads(gzip.decompress(stored[0].body)) == {"content": "Content"}
+        assert stored[0].size == len(gzip.decompress(stored[0].body))
+
+
+def test_store_compressed_bodies_backfills_new_encodings(app, monkeypatch):
+    monkeypatch.setattr(
+        "scripts.fetch_data.compress", lambda data, encoding, level: encoding.encode()
+    )
+    with app.app_context():
+        db.session.add(Decision(id="1", title="A", formation="B", content="Content"))
+        db.session.commit()
+        store_compressed_bodies(app)
+
+        app.config["COMPRESS_ENCODINGS"] = ("br", "gzip")
+        store_compressed_bodies(app)
+
+        stored = DecisionBody.query.filter_by(decision_id="1").all()
+        assert sorted((row.encoding, row.body) for row in stored) == [
+            ("br", b"br"),
+            ("gzip", b"gzip"),
+        ]
+
+
+def test_build_listing_summary(app, tmp_path):
+    app.config["LISTING_SUMMARY_PATH"] = str(tmp_path / "listing.json")
+    with app.app_context():
+        for id in ("2", "1", "3"):
+            db.session.add(Decision(id=id, title="T", formation="A", content=""))
+        db.session.commit()
+
+    build_listing_summary(app)
+
+    summary = ListingSummary(str(tmp_path / "listing.json"))
+    assert summary.total() == 3
+    assert summary.total("A") == 3
+    assert summary.page_start(1, 5) == "1"
+
+
+def test_save_decisions_to_db_database_error(app, caplog):
+    # A database initialized before the data_version table existed
+    DataVersion.__table__.drop(db.engine)
+
+    decision = {"id": "1", "title": "T", "formation": "A", "content": "C"}
+    save_decisions_to_db([decision], app)
+
+    assert "Database error" in caplog.text
+    assert Decision.query.count() == 0
+
+    db.create_all()
+    save_decisions_to_db([decision], app)
+    assert Decision.query.count() == 1
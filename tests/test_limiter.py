@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+from src.limiter import MemoryBackend, SQLiteBackend
+
+
+def test_memory_backend_token_bucket():
+    backend = MemoryBackend()
+
+    assert backend.admit("active:1", 10, "search:1", 2, 1.0, now=0)[1] == 0
+    assert backend.admit("active:1", 10, "search:1", 2, 1.0, now=0)[1] == 0
+    # The bucket is empty, the next token arrives after one second
+    assert backend.admit("active:1", 10, "search:1", 2, 1.0, now=0) == (None, 1.0)
+    assert backend.admit("active:1", 10, "search:1", 2, 1.0, now=1)[1] == 0
+    # Other identities have their own bucket
+    assert backend.admit("active:2", 10, "search:2", 2, 1.0, now=0)[1] == 0
+
+
+def test_memory_backend_concurrency():
+    backend = MemoryBackend()
+
+    slot, _ = backend.admit("active:1", 1, "search:1", 2, 1.0, now=0)
+    assert slot is not None
+    # Rejected for concurrency without drawing the last token
+    assert backend.admit("active:1", 1, "search:1", 2, 1.0, now=0) == (None, 0)
+    backend.release(slot)
+    assert backend.admit("active:1", 1, "search:1", 2, 1.0, now=0)[0] is not None
+
+
+def test_sqlite_backend_shared_between_instances(tmp_path):
+    path = str(tmp_path / "ratelimit.db")
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+
+    slot, _ = first.admit("active:1", 1, "search:1", 1, 0.5, now=0)
+    assert slot is not None
+    assert second.admit("active:1", 1, "search:1", 1, 0.5, now=0) == (None, 0)
+    second.release(slot)
+    assert second.admit("active:1", 1, "search:1", 1, 0.5, now=0) == (None, 2.0)
+
+
+def test_sqlite_backend_reconnects_after_fork(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "ratelimit.db"))
+    slot, _ = backend.admit("active:1", 2, "search:1", 10, 1.0, now=0)
+
+    pid = os.fork()
+    if pid == 0:
+        child_slot, _ = backend.admit("active:1", 2, "search:1", 10, 1.0, now=0)
+        os._exit(0 if child_slot is not None else 1)
+    assert os.waitpid(pid, 0)[1] == 0
+
+    backend.release(slot)
+    assert backend.admit("active:1", 2, "search:1", 10, 1.0, now=0)[0] is not None
+
+
+def test_sqlite_backend_reclaims_leaked_slots(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "ratelimit.db"), slot_ttl=60)
+
+    def admit(key, now):
+        return backend.admit(key, 1, "search:1", 100, 1.0, now)[0]
+
+    # A slot held by a live worker that never releases it expires after the TTL
+    assert admit("active:1", now=0) is not None
+    assert admit("active:1", now=30) is None
+    assert admit("active:1", now=61) is not None
+
+    # A slot held by a worker that was killed is reclaimed right away
+    dead = subprocess.run(
+        [sys.executable, "-c", "import os; print(os.getpid())"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    with sqlite3.connect(backend.path) as conn:
+        conn.execute("DELETE FROM slots")
+        conn.execute(
+            "INSERT INTO slots (key, pid, started) VALUES (?, ?, ?)",
+            ("active:2", int(dead.stdout), 100),
+        )
+    assert admit("active:2", now=100) is not None
+
+
+def test_concurrency_rejection_keeps_token(app, client, auth_headers):
+    app.config["RATELIMIT_BUDGETS"] = {"search": (1, 0.1)}
+    app.config["RATELIMIT_CONCURRENCY"] = 0
+
+    response = client.get("/api/v1/decisions/search?q=test", headers=auth_headers)
+    assert response.status_code == 429
+
+    app.config["RATELIMIT_CONCURRENCY"] = 1
+    response = client.get("/api/v1/decisions/search?q=test", headers=auth_headers)
+    assert response.status_code == 200
+
+
+def test_search_rate_limited(app, client, auth_headers):
+    app.config["RATELIMIT_BUDGETS"] = {"search": (1, 0.1)}
+
+    response = client.get("/api/v1/decisions/search?q=test", headers=auth_headers)
+    assert response.status_code == 200
+
+    response = client.get("/api/v1/decisions/search?q=test", headers=auth_headers)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "10"
+
+
+def test_rate_limit_disabled(app, client, auth_headers):
+    app.config["RATELIMIT_ENABLED"] = False
+    app.config["RATELIMIT_BUDGETS"] = {"search": (1, 0.1)}
+
+    for _ in range(3):
+        response = client.get("/api/v1/decisions/search?q=test", headers=auth_headers)
+        assert response.status_code == 200
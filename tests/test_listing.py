@@ -0,0 +1,86 @@
+from src.listing import (
+    ListingSummary,
+    bump_data_version,
+    data_version,
+    write_summary,
+)
+from src.models import Decision, db
+
+ROWS = [(f"{i:03}", "A" if i % 3 else "B") for i in range(23)]
+
+
+def publish(app, tmp_path):
+    app.config["LISTING_SUMMARY_PATH"] = str(tmp_path / "listing.json")
+    for id, formation in ROWS:
+        db.session.add(Decision(id=id, title=f"Decision {id}", formation=formation))
+    bump_data_version()
+    db.session.commit()
+    write_summary(app.config["LISTING_SUMMARY_PATH"], ROWS, (5, 10), data_version())
+    app.extensions.pop("listing_summary", None)
+
+
+def test_summary(tmp_path):
+    path = str(tmp_path / "listing.json")
+    write_summary(path, ROWS, (10, 5), 3)
+    summary = ListingSummary(path)
+
+    assert summary.version == 3
+    assert summary.page_sizes == {5, 10}
+    assert summary.total() == 23
+    assert summary.total("B") == 8
+    assert summary.total("C") == 0
+    assert summary.page_start(1, 5) == "000"
+    assert summary.page_start(3, 10) == "020"
+    assert summary.page_start(4, 10) is None
+    assert summary.page_start(2, 5, "B") == "015"
+
+
+def test_listing_matches_live_queries(app, client, auth_headers, tmp_path):
+    app.config["RATELIMIT_ENABLED"] = False
+    publish(app, tmp_path)
+    pages = [
+        f"/api/v1/decisions/?page={page}&per_page={per_page}{formation}"
+        for per_page in (5, 10)
+        for page in (1, 2, 3, 4)
+        for formation in ("", "&formation=B", "&formation=C")
+    ]
+
+    from_summary = [client.get(url, headers=auth_headers) for url in pages]
+    app.config["LISTING_SUMMARY_PATH"] = str(tmp_path / "missing.json")
+    app.extensions.pop("listing_summary")
+    live = [client.get(url, headers=auth_headers) for url in pages]
+
+    for url, cached, expected in zip(pages, from_summary, live):
+        assert cached.status_code == expected.status_code != 429, url
+        assert cached.json == expected.json, url
+
+
+def test_listing_non_standard_page_size(app, client, auth_headers, tmp_path):
+    publish(app, tmp_path)
+
+    response = client.get("/api/v1/decisions/?per_page=7&page=2", headers=auth_headers)
+
+    assert response.json["meta"]["total_count"] == 23
+    assert [d["id"] for d in response.json["data"]] == [f"{i:03}" for i in range(7, 14)]
+
+
+def test_stale_summary_falls_back_to_live_queries(app, client, auth_headers, tmp_path):
+    publish(app, tmp_path)
+    url = "/api/v1/decisions/?per_page=5&page=5"
+    assert client.get(url, headers=auth_headers).json["meta"]["total_count"] == 23
+
+    # Ingestion committed new decisions but has not republished the summary yet
+    db.session.add(Decision(id="000a", title="New", formation="A"))
+    bump_data_version()
+    db.session.commit()
+
+    response = client.get(url, headers=auth_headers)
+    assert response.json["meta"]["total_count"] == 24
+    assert [d["id"] for d in response.json["data"]] == ["019", "020", "021", "022"]
+
+    # Workers pick up the republished summary without a restart
+    rows = [("000a", "A")] + ROWS
+    write_summary(app.config["LISTING_SUMMARY_PATH"], rows, (5, 10), data_version())
+    response = client.get(url, headers=auth_headers)
+    assert response.json["meta"]["total_count"] == 24
+    assert app.extensions["listing_summary"].version == 2
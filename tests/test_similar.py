@@ -0,0 +1,66 @@
+from src.models import Decision, db
+from src.similar import EMPTY, SimilarityIndex, signature, similarity, write_index
+
+BASE = (
+    "La Cour de cassation, chambre sociale, a rendu l'arrêt suivant sur le pourvoi "
+    "formé contre l'arrêt rendu par la cour d'appel de Paris dans le litige "
+    "opposant le salarié à son employeur au sujet de son licenciement"
+)
+DOCUMENTS = [
+    ("1", BASE),
+    ("2", BASE + " pour faute grave"),
+    ("3", "Le tribunal correctionnel a condamné le prévenu pour vol aggravé"),
+    ("4", ""),
+]
+
+
+def test_signature_similarity():
+    assert similarity(signature(BASE), signature(BASE)) == 1.0
+    assert similarity(signature(BASE), signature(BASE + " pour faute grave")) > 0.7
+    assert similarity(signature(BASE), signature(DOCUMENTS[2][1])) < 0.2
+    assert set(signature("")) == {EMPTY}
+
+
+def test_similar_lookup(tmp_path):
+    path = str(tmp_path / "similar.idx")
+    assert write_index(path, DOCUMENTS) == 4
+    index = SimilarityIndex(path)
+
+    results = index.similar("1")
+    assert results[0][0] == "2"
+    assert "1" not in [id for id, _ in results]
+    assert index.similar("missing") is None
+    assert [pair[:2] for pair in index.near_duplicates(0.7)] == [("1", "2")]
+
+
+def test_similar_endpoint(app, client, auth_headers, tmp_path):
+    app.config["SIMILAR_INDEX_PATH"] = str(tmp_path / "similar.idx")
+
+    response = client.get("/api/v1/decisions/1/similar", headers=auth_headers)
+    assert response.status_code == 503
+
+    write_index(app.config["SIMILAR_INDEX_PATH"], DOCUMENTS)
+    for id, content in DOCUMENTS:
+        db.session.add(Decision(id=id, title=f"Decision {id}", content=content))
+    db.session.commit()
+
+    response = client.get("/api/v1/decisions/1/similar", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json["data"][0]["id"] == "2"
+    assert response.json["data"][0]["title"] == "Decision 2"
+
+    response = client.get("/api/v1/decisions/missing/similar", headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_empty_and_short_documents_not_similar(tmp_path):
+    path = str(tmp_path / "similar.idx")
+    write_index(
+        path,
+        [("a", ""), ("b", ""), ("c", "un deux"), ("d", "trois quatre"), ("e", BASE)],
+    )
+    index = SimilarityIndex(path)
+
+    assert index.similar("e") == []
+    assert index.similar("a") == []
+    assert index.similar("c") == []
@@ -0,0 +1,54 @@
+import gc
+import os
+import subprocess
+import sys
+
+from src import preload
+from src.suggest import DECISION, write_index
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_api_import_skips_ingestion_dependencies():
+    code = (
+        "import sys, scripts.fetch_data, src.routes.decisions;"
+        "print([m for m in ('requests', 'bs4', 'lxml') if m in sys.modules])"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert output.strip() == "[]"
+
+
+def test_preload(app, client, tmp_path):
+    app.config["SUGGEST_INDEX_PATH"] = str(tmp_path / "suggest.idx")
+    write_index(app.config["SUGGEST_INDEX_PATH"], [(DECISION, "Test", "1")])
+
+    preload(app)
+    gc.unfreeze()
+
+    assert "suggest_index" in app.extensions
+    assert "similar_index" not in app.extensions
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    assert "/api/v1/decisions/suggest" in response.json["paths"]
+
+
+def test_preloaded_index_remapped_after_rebuild(app, client, auth_headers, tmp_path):
+    app.config["SUGGEST_INDEX_PATH"] = str(tmp_path / "suggest.idx")
+    write_index(app.config["SUGGEST_INDEX_PATH"], [(DECISION, "Old", "1")])
+    preload(app)
+    gc.unfreeze()
+
+    # A later fetch_data run swaps in a new file
+    write_index(app.config["SUGGEST_INDEX_PATH"], [(DECISION, "New", "2")])
+
+    response = client.get("/api/v1/decisions/suggest?prefix=new", headers=auth_headers)
+    assert response.json["data"] == [{"id": "2", "title": "New", "type": "decision"}]
+    response = client.get("/api/v1/decisions/suggest?prefix=old", headers=auth_headers)
+    assert response.json["data"] == []
@@ -0,0 +1,48 @@
+from src.suggest import DECISION, FORMATION, PrefixIndex, normalize, write_index
+
+
+def build_index(path):
+    write_index(
+        str(path),
+        [
+            (DECISION, "Cour de cassation, Chambre sociale, 10 janvier 2024", "1"),
+            (DECISION, "Cour de cassation, Chambre criminelle, 3 mai 2023", "2"),
+            (DECISION, "Arrêt de la Chambre commerciale", "3"),
+            (FORMATION, "CHAMBRE_SOCIALE", None),
+            (DECISION, "", "4"),
+        ],
+    )
+    return PrefixIndex(str(path))
+
+
+def test_normalize():
+    assert normalize("  Arrêt   de la  Cour") == "arret de la cour"
+
+
+def test_prefix_lookup(tmp_path):
+    index = build_index(tmp_path / "suggest.idx")
+
+    assert len(index) == 4
+    results = index.lookup("cour de cassation, chambre")
+    assert [r["id"] for r in results] == ["2", "1"]
+
+    assert index.lookup("ARRET") == [
+        {"id": "3", "title": "Arrêt de la Chambre commerciale", "type": "decision"}
+    ]
+    assert index.lookup("chambre_") == [
+        {"id": None, "title": "CHAMBRE_SOCIALE", "type": "formation"}
+    ]
+    assert index.lookup("cour", limit=1)[0]["id"] == "2"
+    assert index.lookup("zzz") == []
+
+
+def test_suggest_endpoint(app, client, auth_headers, tmp_path):
+    app.config["SUGGEST_INDEX_PATH"] = str(tmp_path / "suggest.idx")
+
+    response = client.get("/api/v1/decisions/suggest?prefix=arr", headers=auth_headers)
+    assert response.status_code == 503
+
+    build_index(tmp_path / "suggest.idx")
+    response = client.get("/api/v1/decisions/suggest?prefix=arr", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json["data"][0]["id"] == "3"